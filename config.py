@@ -2,10 +2,15 @@
 LabelWatch AI – config and watchlist for validation MVP.
 """
 
+from pathlib import Path
+
 # FDA DailyMed
 DAILYMED_RSS_URL = "https://dailymed.nlm.nih.gov/dailymed/rss.cfm"
 DAILYMED_SERVICES_BASE = "https://dailymed.nlm.nih.gov/dailymed/services/v2"
 
+# On-disk cache for API responses (SPL content for a given setid/version never changes)
+CACHE_DIR = Path.home() / ".cache" / "labelwatch"
+
 # Watchlist: drug name substrings to match against RSS titles (case-insensitive).
 # Expand to 10 for your 7-day validation; these are examples.
 WATCHLIST_DRUGS = [
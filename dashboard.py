@@ -4,6 +4,8 @@ Run: streamlit run dashboard.py
 """
 
 import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
 
@@ -13,8 +15,19 @@ import streamlit as st
 from config import WATCHLIST_DRUGS
 from report_pdf import build_pdf
 from run import build_impact_report_md, generate_report, generate_report_with_changes
-from scrapers.dailymed import apply_filters, fetch_drug_classes, parse_label_date
-from scrapers.openfda import fetch_fda_validation_for_matches
+from scrapers.dailymed import (
+    LabelUpdate,
+    apply_filters,
+    clear_cache,
+    fetch_drug_classes,
+    fetch_rss_updates,
+    parse_label_date,
+)
+from scrapers.openfda import (
+    clear_cache as clear_fda_cache,
+    fetch_fda_validation_for_matches,
+    validation_tuples,
+)
 
 st.set_page_config(
     page_title="LabelWatch AI",
@@ -23,6 +36,38 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+
+@st.cache_data(ttl=3600, show_spinner="Loading drug classes...")
+def _cached_drug_classes() -> list[dict]:
+    return fetch_drug_classes(pagesize=100, max_pages=5)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_rss() -> list[LabelUpdate]:
+    """DailyMed RSS watchlist matches, shared across sessions for 15 minutes."""
+    updates = fetch_rss_updates(watchlist=WATCHLIST_DRUGS)
+    if updates is None:
+        # Raising keeps the outage out of the cache (an empty list is a real result)
+        raise RuntimeError("DailyMed RSS feed is unavailable; try again shortly.")
+    return updates
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_pdf(
+    matches: list[LabelUpdate],
+    change_texts: list[str],
+    fda_validation: list[tuple[str, int | None]] | None,
+) -> bytes:
+    """PDF bytes for a report, memoized by its inputs so regenerating the same report is free."""
+    return build_pdf(matches, change_texts, fda_validation=fda_validation)
+
+
+@st.cache_resource
+def _pdf_executor() -> ThreadPoolExecutor:
+    """Process-wide pool that builds PDFs off the script thread."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
 # Sidebar: options
 st.sidebar.header("Options")
 use_demo = st.sidebar.checkbox(
@@ -65,14 +110,14 @@ filter_date_end = st.sidebar.date_input(
 if filter_date_start > filter_date_end:
     st.sidebar.warning("From date is after To date; results may be empty.")
 
-# Drug class dropdown (cached)
-if "drug_classes" not in st.session_state:
-    with st.spinner("Loading drug classes..."):
-        try:
-            st.session_state["drug_classes"] = fetch_drug_classes(pagesize=100, max_pages=5)
-        except Exception:
-            st.session_state["drug_classes"] = []
-drug_classes = st.session_state.get("drug_classes", [])
+# Drug class dropdown (cached across sessions)
+try:
+    drug_classes = _cached_drug_classes()
+except Exception:
+    drug_classes = []
+if not drug_classes:
+    # Don't keep an empty list (e.g. API unavailable) cached for the whole TTL
+    _cached_drug_classes.clear()
 drug_class_options = ["All drug classes"] + [f"{c['name']} ({c['type']})" for c in drug_classes]
 drug_class_choice = st.sidebar.selectbox(
     "Drug class",
@@ -104,6 +149,16 @@ st.sidebar.caption("Drug name substrings used to filter the RSS feed (edit in co
 for drug in WATCHLIST_DRUGS:
     st.sidebar.code(drug, language=None)
 
+st.sidebar.markdown("---")
+if st.sidebar.button(
+    "Clear cache",
+    help="Delete cached DailyMed and openFDA responses so the next report re-downloads everything.",
+):
+    clear_cache()
+    clear_fda_cache()
+    st.cache_data.clear()
+    st.sidebar.success("Cache cleared.")
+
 # Main area
 st.title("LabelWatch AI")
 st.markdown("Automated regulatory labeling tracker — FDA DailyMed (last 7 days).")
@@ -114,14 +169,17 @@ if st.button("Generate report", type="primary", use_container_width=False):
         + (" Comparing label versions for changes..." if include_changes and not use_demo else "")
     ):
         try:
+            updates = None if use_demo else cached_rss()
             if include_changes:
                 matches, markdown, change_texts = generate_report_with_changes(
                     demo=use_demo,
+                    updates=updates,
                 )
             else:
                 matches, markdown = generate_report(
                     demo=use_demo,
                     fetch_history=include_history and not use_demo,
+                    updates=updates,
                 )
                 change_texts = [""] * len(matches)
             # Apply filters (date range, drug class, keyword, manufacturer)
@@ -141,9 +199,11 @@ if st.button("Generate report", type="primary", use_container_width=False):
                         parse_label_date(u.updated_date or u.pub_date)
                         for u in filtered_matches
                     ]
-                    fda_validation = fetch_fda_validation_for_matches(
-                        [u.setid for u in filtered_matches],
-                        dailymed_dates,
+                    fda_validation = validation_tuples(
+                        fetch_fda_validation_for_matches(
+                            [u.setid for u in filtered_matches],
+                            dailymed_dates,
+                        )
                     )
             markdown = build_impact_report_md(
                 filtered_matches,
@@ -151,22 +211,30 @@ if st.button("Generate report", type="primary", use_container_width=False):
                 change_texts=filtered_change_texts,
                 fda_validation=fda_validation,
             )
-            pdf_bytes = build_pdf(
+            # Markdown compresses well; keep it compressed in per-session state
+            st.session_state["report_md_z"] = zlib.compress(markdown.encode("utf-8"))
+            st.session_state["report_matches"] = len(filtered_matches)
+            # Keep only the PDF inputs; the bytes live once in the shared cache
+            st.session_state["report_pdf_args"] = (
                 filtered_matches,
                 filtered_change_texts or [],
-                fda_validation=fda_validation,
+                fda_validation,
+            )
+            # Build the PDF in the background; the markdown renders while it runs
+            st.session_state["pdf_future"] = _pdf_executor().submit(
+                _cached_pdf, *st.session_state["report_pdf_args"]
             )
-            st.session_state["report_md"] = markdown
-            st.session_state["report_matches"] = len(filtered_matches)
-            st.session_state["report_pdf"] = pdf_bytes
         except Exception as e:
             st.error(f"Report generation failed: {e}")
-            if "report_md" in st.session_state:
-                del st.session_state["report_md"]
-            if "report_pdf" in st.session_state:
-                del st.session_state["report_pdf"]
+            if "report_md_z" in st.session_state:
+                del st.session_state["report_md_z"]
+            if "report_pdf_args" in st.session_state:
+                del st.session_state["report_pdf_args"]
+            if "pdf_future" in st.session_state:
+                del st.session_state["pdf_future"]
 
-if "report_md" in st.session_state:
+if "report_md_z" in st.session_state:
+    report_md = zlib.decompress(st.session_state["report_md_z"]).decode("utf-8")
     n = st.session_state.get("report_matches", 0)
     st.success(f"Report generated ({n} watchlist match(es)).")
     filters_used = []
@@ -183,25 +251,37 @@ if "report_md" in st.session_state:
     # Download buttons at top so they're always visible (no scrolling to find PDF)
     st.markdown("### Download report")
     col1, col2 = st.columns(2)
-    with col1:
-        st.download_button(
-            label="Download PDF",
-            data=st.session_state.get("report_pdf", b""),
-            file_name="labelwatch_impact_report.pdf",
-            mime="application/pdf",
-            use_container_width=True,
-        )
     with col2:
         st.download_button(
             label="Download .md",
-            data=st.session_state["report_md"],
+            data=report_md,
             file_name="labelwatch_impact_report.md",
             mime="text/markdown",
             use_container_width=True,
         )
     st.markdown("---")
     st.subheader("Impact report")
-    st.markdown(st.session_state["report_md"])
+    st.markdown(report_md)
+    # Filled in last so the report above is visible while the PDF finishes
+    with col1:
+        try:
+            # The future is only needed for the first render; dropping it keeps its result (the
+            # PDF bytes) out of session state. Later reruns read the bytes from _cached_pdf.
+            pdf_future = st.session_state.pop("pdf_future", None)
+            if pdf_future is not None:
+                pdf_bytes = pdf_future.result()
+            else:
+                pdf_bytes = _cached_pdf(*st.session_state["report_pdf_args"])
+        except Exception as e:
+            st.error(f"PDF generation failed: {e}")
+        else:
+            st.download_button(
+                label="Download PDF",
+                data=pdf_bytes,
+                file_name="labelwatch_impact_report.pdf",
+                mime="application/pdf",
+                use_container_width=True,
+            )
 else:
     st.info("Click **Generate report** to fetch DailyMed updates and build the impact report (with optional PDF and what changed).")
     st.caption("Use the sidebar to include label diffs (Warnings, Dosage, etc.) and download as PDF.")
@@ -7,17 +7,17 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from io import BytesIO
-
 from fpdf import FPDF
 
 from scrapers.dailymed import LabelUpdate
 
 
 def _sanitize(s: str, max_len: int = 2000) -> str:
-    """Remove characters that can break fpdf2 and truncate."""
-    s = (s or "").encode("latin-1", errors="replace").decode("latin-1")
-    return s[:max_len] if len(s) > max_len else s
+    """Remove characters that can break fpdf2 and truncate (one encode, slice, one decode)."""
+    if not s:
+        return ""
+    # latin-1 is one byte per character, so slicing the bytes truncates by characters
+    return s.encode("latin-1", errors="replace")[:max_len].decode("latin-1")
 
 
 class ReportPDF(FPDF):
@@ -85,6 +85,4 @@ def build_pdf(
             pdf.ln(2)
         pdf.ln(2)
 
-    buf = BytesIO()
-    pdf.output(buf)
-    return buf.getvalue()
+    return bytes(pdf.output())
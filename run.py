@@ -17,12 +17,14 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config import WATCHLIST_DRUGS
 from scrapers.dailymed import (
+    clear_cache,
     fetch_rss_updates,
     filter_updates_by_watchlist,
     fetch_spl_history,
-    get_label_changes,
+    get_label_changes_for_updates,
     LabelUpdate,
 )
+from scrapers.openfda import clear_cache as clear_fda_cache
 
 # Sample data for --demo (no network needed)
 DEMO_UPDATES = [
@@ -117,14 +119,19 @@ def generate_report(
     demo: bool = False,
     fetch_history: bool = False,
     watchlist: list[str] | None = None,
+    updates: list[LabelUpdate] | None = None,
 ) -> tuple[list[LabelUpdate], str]:
-    """Fetch data, build report; returns (matches, markdown_string)."""
+    """
+    Fetch data, build report; returns (matches, markdown_string).
+    Pass updates (RSS items already filtered by the watchlist) to reuse an already-fetched feed.
+    """
     drugs = watchlist if watchlist is not None else WATCHLIST_DRUGS
     if demo:
         matches = DEMO_UPDATES
+    elif updates is None:
+        matches = fetch_rss_updates(watchlist=drugs) or []
     else:
-        updates = fetch_rss_updates()
-        matches = filter_updates_by_watchlist(updates, drugs)
+        matches = updates
     md = build_impact_report_md(matches, fetch_history=fetch_history)
     return matches, md
 
@@ -132,10 +139,12 @@ def generate_report(
 def generate_report_with_changes(
     demo: bool = False,
     watchlist: list[str] | None = None,
+    updates: list[LabelUpdate] | None = None,
 ) -> tuple[list[LabelUpdate], str, list[str]]:
     """
     Fetch data, build report, and compute "what changed" per label (current vs previous SPL).
     Returns (matches, markdown_string with changes inline, list of change_summary per match).
+    Pass updates (RSS items already filtered by the watchlist) to reuse an already-fetched feed.
     """
     drugs = watchlist if watchlist is not None else WATCHLIST_DRUGS
     if demo:
@@ -145,11 +154,8 @@ def generate_report_with_changes(
             for _ in matches
         ]
     else:
-        updates = fetch_rss_updates()
-        matches = filter_updates_by_watchlist(updates, drugs)
-        change_texts = []
-        for u in matches:
-            change_texts.append(get_label_changes(u.setid, u.version))
+        matches = updates if updates is not None else fetch_rss_updates(watchlist=drugs) or []
+        change_texts = get_label_changes_for_updates(matches)
     md = build_impact_report_md(matches, fetch_history=False, change_texts=change_texts)
     return matches, md, change_texts
 
@@ -158,14 +164,23 @@ def main() -> None:
     p = argparse.ArgumentParser(description="LabelWatch AI – fetch DailyMed updates and write impact report.")
     p.add_argument("--no-history", action="store_true", help="Skip SPL history API calls (faster).")
     p.add_argument("--demo", action="store_true", help="Use sample data so you can see the report without the live RSS.")
+    p.add_argument("--clear-cache", action="store_true", help="Delete cached DailyMed and openFDA responses before running.")
     args = p.parse_args()
 
+    if args.clear_cache:
+        clear_cache()
+        clear_fda_cache()
+        print("Cleared DailyMed and openFDA response caches.")
+
     if args.demo:
         print("Demo mode: using sample label updates (no network).")
         matches = DEMO_UPDATES
     else:
         print("Fetching DailyMed RSS (last 7 days)...")
         updates = fetch_rss_updates()
+        if updates is None:
+            print("DailyMed RSS feed is unavailable.")
+            updates = []
         print(f"Total updates in feed: {len(updates)}")
         matches = filter_updates_by_watchlist(updates, WATCHLIST_DRUGS)
         print(f"Watchlist matches: {len(matches)}")
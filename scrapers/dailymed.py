@@ -6,17 +6,26 @@ FDA DailyMed RSS and REST API client.
 
 import difflib
 import io
+import json
 import re
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
+from html.entities import name2codepoint
+from typing import IO, Callable
 from urllib.parse import urlparse, parse_qs
 
-import feedparser
+import ahocorasick
+import diskcache
 import requests
 from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from config import DAILYMED_RSS_URL, DAILYMED_SERVICES_BASE
+from config import CACHE_DIR, DAILYMED_RSS_URL, DAILYMED_SERVICES_BASE
 
 # DailyMed URLs for SPL content
 DAILYMED_BASE = "https://dailymed.nlm.nih.gov/dailymed"
@@ -27,9 +36,56 @@ SPL_SECTION_CODES = {
     "43685-7": "Contraindications",
     "42232-9": "Indications and Usage",
 }
-
-
-@dataclass
+_HL7_NS = "urn:hl7-org:v3"
+_HL7_CODE = f"{{{_HL7_NS}}}code"
+_HL7_SECTION = f"{{{_HL7_NS}}}section"
+# iterparse tag for <section> in any namespace (or none); HL7 sections are preferred
+_SECTION_TAG = "{*}section"
+# Compiled once: text body of a section (namespaced, then any-namespace fallback)
+_SECTION_TEXT_XPATH = etree.XPath(".//hl7:text", namespaces={"hl7": _HL7_NS})
+_SECTION_TEXT_XPATH_ANY_NS = etree.XPath(".//*[local-name()='text']")
+# Max labels compared concurrently in get_label_changes_for_updates
+LABEL_CHANGES_MAX_WORKERS = 8
+# Max concurrent page requests when paginating DailyMed list endpoints
+PAGINATION_MAX_WORKERS = 8
+
+# Response cache TTLs in seconds (None = never expires; old SPL versions are immutable)
+HISTORY_TTL = 3600
+CURRENT_SPL_TTL = 3600
+DRUG_CLASSES_TTL = 24 * 3600
+DRUG_CLASS_SETIDS_TTL = 3600
+
+# Strict (no recover mode: a recovered tree silently drops text), no entity expansion or network access
+_RSS_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+# Fallback for feeds that aren't well-formed XML: HTML named entities (&reg;) and bare "&"
+_XML_ENTITIES = frozenset({b"amp", b"lt", b"gt", b"quot", b"apos"})
+_ENTITY_RE = re.compile(rb"&([A-Za-z][A-Za-z0-9]*);")
+_BARE_AMP_RE = re.compile(rb"&(?!#[0-9]+;|#x[0-9A-Fa-f]+;|[A-Za-z][A-Za-z0-9]*;)")
+_TZ_SUFFIX_RE = re.compile(r"\s+(?:E[SD]T|P[SD]T|UTC)$")
+# The document's own <versionNumber> comes first, in the SPL header
+_SPL_VERSION_RE = re.compile(r'<(?:\w+:)?versionNumber\s+value="(\d+)"')
+
+# Raw responses and parsed SPL sections; bounded, evicting least-recently-used entries
+_cache = diskcache.Cache(
+    str(CACHE_DIR / "dailymed"),
+    size_limit=int(500e6),
+    eviction_policy="least-recently-used",
+)
+
+# Shared session: keep-alive connection pool sized for the concurrent fetchers above.
+# requests' default Accept-Encoding adds "br" when brotli is installed.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+
+@dataclass(slots=True)
 class LabelUpdate:
     """One item from DailyMed RSS (one label update in last 7 days)."""
     title: str
@@ -38,6 +94,60 @@ class LabelUpdate:
     version: int
     updated_date: str
     pub_date: str
+    title_lower: str = ""  # precomputed title.lower() read by the filters; derived if not given
+
+    def __post_init__(self):
+        if not self.title_lower:
+            self.title_lower = self.title.lower()
+
+
+def _cached_get(
+    url: str,
+    ttl: int | None = None,
+    *,
+    params: dict | None = None,
+    timeout: int = 30,
+    validate=None,
+    cache_key=None,
+) -> bytes:
+    """
+    GET url through the on-disk cache; returns response bytes.
+    Raises requests.RequestException on network/HTTP error. If validate is given,
+    the response is only cached when validate(content) is true. The cache key is the
+    full request URL unless cache_key is given.
+    """
+    key = cache_key if cache_key is not None else requests.Request("GET", url, params=params).prepare().url
+    hit = _cache.get(key)
+    if hit is not None:
+        return hit["content"]
+    r = _SESSION.get(url, params=params, timeout=timeout)
+    r.raise_for_status()
+    if validate is None or validate(r.content):
+        _cache.set(
+            key,
+            {
+                "content": r.content,
+                "content_type": r.headers.get("Content-Type", ""),
+                "etag": r.headers.get("ETag", ""),
+                "fetched_at": time.time(),
+            },
+            expire=ttl,
+        )
+    return r.content
+
+
+def _is_json(content: bytes) -> bool:
+    """validate= check for JSON endpoints, so an HTML error/maintenance page (served as 200) isn't cached."""
+    try:
+        json.loads(content)
+    except ValueError:
+        return False
+    return True
+
+
+def clear_cache() -> None:
+    """Delete all cached DailyMed responses and parsed SPL sections."""
+    _cache.clear()
 
 
 def parse_setid_version_from_link(link: str) -> tuple[str | None, int | None]:
@@ -55,22 +165,60 @@ def parse_setid_version_from_link(link: str) -> tuple[str | None, int | None]:
     return setid, version
 
 
-def fetch_rss_updates(rss_url: str = DAILYMED_RSS_URL) -> list[LabelUpdate]:
-    """Fetch and parse DailyMed RSS (last 7 days of updates)."""
-    feed = feedparser.parse(rss_url)
+def _html_entity_to_xml(m: re.Match) -> bytes:
+    name = m.group(1)
+    if name in _XML_ENTITIES:
+        return m.group(0)
+    codepoint = name2codepoint.get(name.decode("ascii"))
+    return b"&#%d;" % codepoint if codepoint is not None else m.group(0)
+
+
+def _parse_rss(content: bytes):
+    """
+    Parse RSS bytes strictly. If that fails, map HTML named entities to character references,
+    escape bare "&", and parse strictly again. Raises etree.XMLSyntaxError if still malformed.
+    """
+    try:
+        return etree.fromstring(content, parser=_RSS_PARSER)
+    except etree.XMLSyntaxError:
+        fixed = _BARE_AMP_RE.sub(b"&amp;", _ENTITY_RE.sub(_html_entity_to_xml, content))
+        return etree.fromstring(fixed, parser=_RSS_PARSER)
+
+
+def fetch_rss_updates(
+    rss_url: str = DAILYMED_RSS_URL,
+    watchlist: list[str] | None = None,
+) -> list[LabelUpdate] | None:
+    """
+    Fetch and parse DailyMed RSS (last 7 days of updates). Returns None if the feed is unavailable
+    (so callers can tell an outage from a week with no matching updates).
+    If watchlist is given, only items whose title matches it are kept (same rule as filter_updates_by_watchlist).
+    """
+    matches_watchlist = _watchlist_matcher(watchlist) if watchlist is not None else None
+    try:
+        r = _SESSION.get(rss_url, timeout=30)
+        r.raise_for_status()
+        root = _parse_rss(r.content)
+    except (requests.RequestException, etree.XMLSyntaxError):
+        return None
     updates = []
-    for entry in feed.entries:
-        link = entry.get("link") or ""
+    for item in root.iter("item"):
+        title = (item.findtext("title") or "").strip()
+        title_lower = title.lower()
+        if matches_watchlist is not None and not matches_watchlist(title_lower):
+            continue
+        link = (item.findtext("link") or "").strip()
         setid, version = parse_setid_version_from_link(link)
         if not setid:
             continue
         # description often like "Updated Date: Fri, 13 Feb 2026 00:00:00 EST"
-        desc = entry.get("description", "")
+        desc = item.findtext("description") or ""
         updated_date = desc.replace("Updated Date: ", "").strip() if "Updated Date:" in desc else ""
-        pub = entry.get("published", "")
+        pub = (item.findtext("pubDate") or "").strip()
         updates.append(
             LabelUpdate(
-                title=entry.get("title", ""),
+                title=title,
+                title_lower=title_lower,
                 link=link,
                 setid=setid,
                 version=version,
@@ -81,73 +229,122 @@ def fetch_rss_updates(rss_url: str = DAILYMED_RSS_URL) -> list[LabelUpdate]:
     return updates
 
 
+@lru_cache(maxsize=64)
+def _watchlist_automaton(substrings: tuple[str, ...]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton over the lowercased watchlist (built once per tuple)."""
+    automaton = ahocorasick.Automaton()
+    for i, sub in enumerate(substrings):
+        automaton.add_word(sub.lower(), (i, sub))
+    automaton.make_automaton()
+    return automaton
+
+
+def _watchlist_matcher(drug_substrings: list[str]) -> Callable[[str], bool]:
+    """Predicate on a lowercased title: does it contain any watchlist string (one scan for all drugs)."""
+    if not drug_substrings:
+        return lambda title_lower: False
+    if "" in drug_substrings:
+        return lambda title_lower: True  # an empty substring matches every title
+    automaton = _watchlist_automaton(tuple(drug_substrings))
+    return lambda title_lower: next(automaton.iter(title_lower), None) is not None
+
+
 def filter_updates_by_watchlist(
     updates: list[LabelUpdate],
     drug_substrings: list[str],
 ) -> list[LabelUpdate]:
     """Keep only updates whose title contains any of the watchlist strings."""
-    out = []
-    lower_substrings = [s.lower() for s in drug_substrings]
-    for u in updates:
-        title_lower = u.title.lower()
-        if any(sub in title_lower for sub in lower_substrings):
-            out.append(u)
-    return out
+    matches_watchlist = _watchlist_matcher(drug_substrings)
+    return [u for u in updates if matches_watchlist(u.title_lower)]
 
 
+@lru_cache(maxsize=4096)
 def parse_label_date(date_str: str) -> date | None:
-    """Parse RSS date string (e.g. 'Fri, 13 Feb 2026 00:00:00 EST') to date."""
+    """Parse RSS date string (e.g. 'Fri, 13 Feb 2026 00:00:00 EST') to date. Results are memoized."""
     if not date_str:
         return None
-    s = date_str.strip()
     # Strip timezone suffix for strptime (e.g. " EST" or " EDT")
-    for tz in (" EST", " EDT", " UTC", " PST", " PDT"):
-        if s.endswith(tz):
-            s = s[: -len(tz)].strip()
-            break
-    try:
-        for fmt in (
-            "%a, %d %b %Y %H:%M:%S",
-            "%Y-%m-%d",
-            "%b %d, %Y",
-            "%d %b %Y",
-        ):
-            try:
-                dt = datetime.strptime(s[:30], fmt)
-                return dt.date()
-            except ValueError:
-                continue
-    except Exception:
-        pass
+    s = _TZ_SUFFIX_RE.sub("", date_str.strip())
+    for fmt in (
+        "%a, %d %b %Y %H:%M:%S",
+        "%Y-%m-%d",
+        "%b %d, %Y",
+        "%d %b %Y",
+    ):
+        try:
+            return datetime.strptime(s[:30], fmt).date()
+        except ValueError:
+            continue
     return None
 
 
-def fetch_drug_classes(pagesize: int = 100, max_pages: int = 20) -> list[dict]:
-    """Fetch drug class list from DailyMed (name, code, type). Returns list of {name, code, type}."""
-    out = []
-    page = 1
-    while page <= max_pages:
-        url = f"{DAILYMED_SERVICES_BASE}/drugclasses.json?pagesize={pagesize}&page={page}"
+def _fetch_list_page(url: str, params: dict, ttl: int | None) -> dict | None:
+    """One page of a DailyMed list endpoint as JSON, or None on error."""
+    try:
+        return json.loads(_cached_get(url, ttl, params=params, validate=_is_json))
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def _fetch_all_pages(url: str, params: dict, ttl: int | None, max_pages: int) -> list[dict]:
+    """
+    Fetch up to max_pages of a paginated DailyMed list endpoint; returns the concatenated "data" items.
+    Page 1 gives metadata.total_pages, then the remaining pages are fetched concurrently.
+    Without a page count, follows next_page sequentially. Stops at the first failed or empty page.
+    """
+    if max_pages < 1:
+        return []
+
+    def get_page(page: int) -> dict | None:
+        return _fetch_list_page(url, {**params, "page": page}, ttl)
+
+    def is_last(data: dict) -> bool:
+        meta = data.get("metadata") or {}
+        return str(meta.get("next_page", "")) == "null"
+
+    first = get_page(1)
+    pages = [first]
+    if first and first.get("data") and not is_last(first):
         try:
-            r = requests.get(url, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            items = (data.get("data") or [])
-            if not items:
-                break
-            for item in items:
-                out.append({
-                    "name": item.get("name", ""),
-                    "code": item.get("code", ""),
-                    "type": item.get("type", ""),
-                })
-            meta = data.get("metadata") or {}
-            if str(meta.get("next_page", "")) == "null" or not items:
-                break
-            page += 1
-        except requests.RequestException:
+            total_pages = int((first.get("metadata") or {}).get("total_pages"))
+        except (TypeError, ValueError):
+            total_pages = None
+        if total_pages is not None:
+            rest = range(2, min(total_pages, max_pages) + 1)
+            with ThreadPoolExecutor(max_workers=PAGINATION_MAX_WORKERS) as ex:
+                pages.extend(ex.map(get_page, rest))
+        else:
+            for page in range(2, max_pages + 1):
+                data = get_page(page)
+                pages.append(data)
+                if not data or not data.get("data") or is_last(data):
+                    break
+
+    items: list[dict] = []
+    for data in pages:
+        page_items = (data or {}).get("data") or []
+        if not page_items:
             break
-    return out
+        items.extend(page_items)
+    return items
+
+
+def fetch_drug_classes(pagesize: int = 100, max_pages: int = 20) -> list[dict]:
+    """Fetch drug class list from DailyMed (name, code, type). Returns list of {name, code, type}."""
+    items = _fetch_all_pages(
+        f"{DAILYMED_SERVICES_BASE}/drugclasses.json",
+        {"pagesize": pagesize},
+        DRUG_CLASSES_TTL,
+        max_pages,
+    )
+    return [
+        {
+            "name": item.get("name", ""),
+            "code": item.get("code", ""),
+            "type": item.get("type", ""),
+        }
+        for item in items
+    ]
 
 
 def fetch_spl_setids_for_drug_class(
@@ -158,32 +355,17 @@ def fetch_spl_setids_for_drug_class(
     """Fetch all setids for SPLs in the given drug class (optionally published on or after date)."""
     if not drug_class_code:
         return set()
-    setids = set()
-    page = 1
     params = {"drug_class_code": drug_class_code, "pagesize": 100}
     if published_date_gte:
         params["published_date"] = published_date_gte
         params["published_date_comparison"] = "gte"
-    while page <= max_pages:
-        params["page"] = page
-        try:
-            r = requests.get(f"{DAILYMED_SERVICES_BASE}/spls.json", params=params, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            items = (data.get("data") or [])
-            if not items:
-                break
-            for item in items:
-                sid = item.get("setid")
-                if sid:
-                    setids.add(sid)
-            meta = data.get("metadata") or {}
-            if str(meta.get("next_page", "")) == "null":
-                break
-            page += 1
-        except requests.RequestException:
-            break
-    return setids
+    items = _fetch_all_pages(
+        f"{DAILYMED_SERVICES_BASE}/spls.json",
+        params,
+        DRUG_CLASS_SETIDS_TTL,
+        max_pages,
+    )
+    return {item["setid"] for item in items if item.get("setid")}
 
 
 def apply_filters(
@@ -206,77 +388,52 @@ def apply_filters(
     if texts is not None and len(texts) != len(result):
         texts = (texts + [""] * len(result))[:len(result)]
 
+    # Collect active predicates, then evaluate them all in a single pass
+    preds = []
+
     if date_start is not None or date_end is not None:
-        filtered = []
-        filtered_texts = [] if texts else None
-        for i, u in enumerate(result):
+        def date_ok(u: LabelUpdate) -> bool:
             d = parse_label_date(u.updated_date or u.pub_date)
             if d is None:
-                filtered.append(u)
-                if filtered_texts is not None:
-                    filtered_texts.append(texts[i])
-            else:
-                if date_start is not None and d < date_start:
-                    continue
-                if date_end is not None and d > date_end:
-                    continue
-                filtered.append(u)
-                if filtered_texts is not None:
-                    filtered_texts.append(texts[i])
-        result = filtered
-        texts = filtered_texts
+                return True  # keep labels with no parseable date
+            if date_start is not None and d < date_start:
+                return False
+            if date_end is not None and d > date_end:
+                return False
+            return True
+
+        preds.append(date_ok)
 
     if drug_class_code or drug_class_setids is not None:
         allowed = drug_class_setids if drug_class_setids is not None else set()
         if drug_class_code and not allowed:
             allowed = fetch_spl_setids_for_drug_class(drug_class_code)
         if allowed:
-            filtered = []
-            filtered_texts = [] if texts else None
-            for i, u in enumerate(result):
-                if u.setid in allowed:
-                    filtered.append(u)
-                    if filtered_texts is not None:
-                        filtered_texts.append(texts[i])
-            result = filtered
-            texts = filtered_texts
+            preds.append(lambda u: u.setid in allowed)
 
     keyword = (keyword or "").strip().lower()
     if keyword:
-        filtered = []
-        filtered_texts = [] if texts else None
-        for i, u in enumerate(result):
-            if keyword in u.title.lower():
-                filtered.append(u)
-                if filtered_texts is not None:
-                    filtered_texts.append(texts[i])
-        result = filtered
-        texts = filtered_texts
+        preds.append(lambda u: keyword in u.title_lower)
 
     manufacturer = (manufacturer or "").strip().lower()
     if manufacturer:
-        filtered = []
-        filtered_texts = [] if texts else None
-        for i, u in enumerate(result):
-            # Manufacturer often in [Brackets] at end of title
-            if manufacturer in u.title.lower():
-                filtered.append(u)
-                if filtered_texts is not None:
-                    filtered_texts.append(texts[i])
-        result = filtered
-        texts = filtered_texts
+        # Manufacturer often in [Brackets] at end of title
+        preds.append(lambda u: manufacturer in u.title_lower)
 
-    return result, texts
+    if not preds:
+        return result, texts
+    if texts is None:
+        return [u for u in result if all(p(u) for p in preds)], None
+    kept = [(u, t) for u, t in zip(result, texts) if all(p(u) for p in preds)]
+    return [u for u, _ in kept], [t for _, t in kept]
 
 
 def fetch_spl_history(setid: str) -> dict | None:
     """Fetch version history for an SPL (setid). Returns JSON data or None."""
     url = f"{DAILYMED_SERVICES_BASE}/spls/{setid}/history.json"
     try:
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        return r.json()
-    except requests.RequestException:
+        return json.loads(_cached_get(url, HISTORY_TTL, validate=_is_json))
+    except (requests.RequestException, ValueError):
         return None
 
 
@@ -293,103 +450,188 @@ def get_previous_version(setid: str, current_version: int) -> int | None:
     return None
 
 
-def fetch_spl_xml(setid: str) -> str | None:
-    """Fetch current SPL document as XML string."""
+def _spl_document_version(xml: str | bytes) -> int | None:
+    """versionNumber of an SPL document (from its header), or None if not found."""
+    head = xml[:65536]
+    if isinstance(head, bytes):
+        head = head.decode("latin-1")
+    m = _SPL_VERSION_RE.search(head)
+    return int(m.group(1)) if m else None
+
+
+def fetch_spl_xml(setid: str, version: int | None = None) -> str | None:
+    """
+    Fetch current SPL document as XML string. The live document is whatever version is newest;
+    with version given, it is cached (for CURRENT_SPL_TTL) only under that version and only when
+    the document really is that version, so a newer label is never served from an older entry.
+    """
     url = f"{DAILYMED_SERVICES_BASE}/spls/{setid}.xml"
     try:
-        r = requests.get(url, timeout=60)
-        r.raise_for_status()
-        return r.text
+        if version is None:
+            content = _cached_get(url, CURRENT_SPL_TTL, timeout=60)
+        else:
+            content = _cached_get(
+                url,
+                CURRENT_SPL_TTL,
+                timeout=60,
+                validate=lambda b: _spl_document_version(b) == version,
+                cache_key=(url, version),
+            )
+        return content.decode("utf-8", errors="replace")
     except requests.RequestException:
         return None
 
 
 def fetch_spl_zip(setid: str, version: int) -> bytes | None:
-    """Fetch a specific SPL version as ZIP (for older versions)."""
+    """Fetch a specific SPL version as ZIP (for older versions). Cached indefinitely."""
     url = f"{DAILYMED_BASE}/getFile.cfm?type=zip&setid={setid}&version={version}"
     try:
-        r = requests.get(url, timeout=60)
-        r.raise_for_status()
-        return r.content
+        return _cached_get(url, None, timeout=60, validate=lambda b: b[:2] == b"PK")
     except requests.RequestException:
         return None
 
 
-def _extract_xml_from_spl_zip(zip_bytes: bytes) -> str | None:
-    """Extract the main SPL XML from a DailyMed ZIP (single .xml or in subdir)."""
+def _open_xml_from_spl_zip(zip_bytes: bytes) -> IO[bytes] | None:
+    """
+    Open the main SPL XML in a DailyMed ZIP (single .xml or in subdir) as a decompressing stream.
+    The member is never fully decompressed into memory; the caller closes the stream.
+    """
     try:
         with zipfile.ZipFile(io.BytesIO(zip_bytes), "r") as z:
-            for name in z.namelist():
-                if name.endswith(".xml") and "spl" in name.lower():
-                    return z.read(name).decode("utf-8", errors="replace")
-            # fallback: first .xml
-            for name in z.namelist():
-                if name.endswith(".xml"):
-                    return z.read(name).decode("utf-8", errors="replace")
+            names = z.namelist()
+            name = next((n for n in names if n.endswith(".xml") and "spl" in n.lower()), None)
+            if name is None:
+                # fallback: first .xml
+                name = next((n for n in names if n.endswith(".xml")), None)
+            return z.open(name) if name else None
     except Exception:
         pass
     return None
 
 
-def _strip_html_to_text(html_fragment: str) -> str:
-    """Crude strip of HTML tags for plain-text diff."""
-    if not html_fragment:
-        return ""
-    text = re.sub(r"<[^>]+>", " ", html_fragment)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+def _collapse_whitespace(text: str) -> str:
+    """
+    Collapse whitespace for plain-text diff. The input is already text (etree.tostring(method="text")),
+    so entity-decoded characters like "<" are content, not markup, and must not be re-parsed.
+    """
+    return " ".join(text.split())
+
+
+def _section_code(section) -> str | None:
+    """LOINC code of an SPL <section> (from its direct <code> child)."""
+    code_el = section.find(_HL7_CODE)
+    if code_el is None:
+        code_el = section.find("{*}code")
+    return code_el.get("code") if code_el is not None else None
 
 
-def parse_spl_sections(xml_str: str) -> dict[str, str]:
-    """Extract key sections from SPL XML. Returns dict: section_name -> plain text."""
-    if not xml_str:
+def parse_spl_sections(source: str | bytes | IO[bytes]) -> dict[str, str]:
+    """
+    Extract key sections from SPL XML (string, bytes or binary file-like). Returns dict: section_name -> plain text.
+    Streams the document with iterparse (one pass for all section codes) and
+    frees each top-level section once it has been inspected.
+    """
+    if not source:
         return {}
-    ns = {"hl7": "urn:hl7-org:v3"}
-    out = {}
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    # name -> (rank, text); rank prefers HL7-namespaced sections, then document order (so an
+    # outer section beats a nested one with the same code, although the nested one ends first)
+    found: dict[str, tuple[tuple[int, int], str]] = {}
+    starts: list[int] = []
+    n_started = 0
     try:
-        root = etree.fromstring(xml_str.encode("utf-8"))
-        for code, name in SPL_SECTION_CODES.items():
-            sections = root.xpath(
-                f"//hl7:section[hl7:code[@code='{code}']]",
-                namespaces=ns,
-            )
-            if not sections:
-                sections = root.xpath(
-                    f"//*[local-name()='section'][*[local-name()='code'][@code='{code}']]"
-                )
-            for sec in sections:
-                text_el = sec.xpath(".//hl7:text", namespaces=ns)
-                if not text_el:
-                    text_el = sec.xpath(".//*[local-name()='text']")
-                if text_el:
+        context = etree.iterparse(
+            source,
+            events=("start", "end"),
+            tag=_SECTION_TAG,
+            huge_tree=False,
+            resolve_entities=False,
+            remove_comments=True,
+            remove_pis=True,
+        )
+        for event, sec in context:
+            if event == "start":
+                starts.append(n_started)
+                n_started += 1
+                continue
+            rank = (0 if sec.tag == _HL7_SECTION else 1, starts.pop())
+            name = SPL_SECTION_CODES.get(_section_code(sec))
+            if name and (name not in found or rank < found[name][0]):
+                text_els = _SECTION_TEXT_XPATH(sec) or _SECTION_TEXT_XPATH_ANY_NS(sec)
+                if text_els:
                     raw = etree.tostring(
-                        text_el[0],
+                        text_els[0],
                         encoding="unicode",
                         method="text",
                         with_tail=False,
                     )
-                    out[name] = _strip_html_to_text(raw)[:8000]
+                    found[name] = (rank, _collapse_whitespace(raw)[:8000])
+            if not starts:
+                # Subsections end before their parent, so a finished top-level section can go
+                sec.clear(keep_tail=True)
+                while sec.getprevious() is not None:
+                    del sec.getparent()[0]
+                # With no section open, nothing later can outrank an HL7 match already found
+                if len(found) == len(SPL_SECTION_CODES) and all(r[0] == 0 for r, _ in found.values()):
                     break
     except Exception:
         pass
-    return out
+    return {name: text for name, (_, text) in found.items()}
+
+
+def get_spl_sections(setid: str, version: int, *, current: bool = False) -> dict[str, str]:
+    """
+    Key sections for one SPL version, cached on disk by (setid, version) since a version's content never changes.
+    current=True reads the live SPL XML instead (for the version the RSS reports as current), cached by
+    (setid, version) for CURRENT_SPL_TTL. If the live document is a different version, that version's
+    ZIP is used instead. Empty results (fetch or parse failures) are not cached.
+    """
+    if current:
+        key = ("spl_sections_current", setid, version)
+        sections = _cache.get(key)
+        if sections is not None:
+            return sections
+        xml = fetch_spl_xml(setid, version)
+        if not xml:
+            return {}
+        if _spl_document_version(xml) != version:
+            # Live label has moved on (or lags the RSS); don't attribute its text to this version
+            return get_spl_sections(setid, version)
+        sections = parse_spl_sections(xml)
+        if sections:
+            _cache.set(key, sections, expire=CURRENT_SPL_TTL)
+        return sections
+    key = ("spl_sections", setid, version)
+    sections = _cache.get(key)
+    if sections is not None:
+        return sections
+    sections = {}
+    zip_bytes = fetch_spl_zip(setid, version)
+    fp = _open_xml_from_spl_zip(zip_bytes) if zip_bytes else None
+    if fp is not None:
+        with fp:
+            sections = parse_spl_sections(fp)
+    if sections:
+        _cache.set(key, sections)
+    return sections
 
 
 def _parse_unified_diff_to_added_removed(
     old_lines: list[str],
     new_lines: list[str],
 ) -> tuple[list[str], list[str]]:
-    """Convert unified diff to (added_lines, removed_lines) for readable formatting."""
-    diff = list(
-        difflib.unified_diff(old_lines, new_lines, lineterm="", n=0),
-    )
+    """Line diff as (added_lines, removed_lines), read straight from SequenceMatcher opcodes."""
     added: list[str] = []
     removed: list[str] = []
-    for line in diff:
-        if line.startswith("+") and not line.startswith("+++"):
-            added.append(line[1:].strip())
-        elif line.startswith("-") and not line.startswith("---"):
-            removed.append(line[1:].strip())
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("replace", "delete"):
+            removed.extend(line.strip() for line in old_lines[i1:i2])
+        if tag in ("replace", "insert"):
+            added.extend(line.strip() for line in new_lines[j1:j2])
     return added, removed
 
 
@@ -400,19 +642,21 @@ def get_label_changes(
 ) -> str:
     """
     Compare current SPL to previous version; return human-readable summary of changes.
-    include_sections: optional {section_name: text} to use as "current" when XML fetch fails.
+    include_sections: optional {section_name: text} used as the "current" sections (skips the current XML fetch).
     """
-    sections_to_use = include_sections or SPL_SECTION_CODES
     prev_version = get_previous_version(setid, current_version)
     if prev_version is None:
         return "No previous version available for comparison."
 
-    current_xml = fetch_spl_xml(setid)
-    current_sections = parse_spl_sections(current_xml) if current_xml else {}
-
-    zip_bytes = fetch_spl_zip(setid, prev_version)
-    old_xml = _extract_xml_from_spl_zip(zip_bytes) if zip_bytes else None
-    old_sections = parse_spl_sections(old_xml) if old_xml else {}
+    if include_sections:
+        current_sections = include_sections
+        old_sections = get_spl_sections(setid, prev_version)
+    else:
+        # Current and previous versions are independent; load them concurrently.
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            old_future = ex.submit(get_spl_sections, setid, prev_version)
+            current_sections = get_spl_sections(setid, current_version, current=True)
+            old_sections = old_future.result()
 
     if not current_sections and not old_sections:
         return "Could not retrieve label content for comparison (API may be temporarily unavailable)."
@@ -456,3 +700,14 @@ def get_label_changes(
         lines.append("")
 
     return "\n".join(lines).strip() if lines else "No text changes detected in key sections (Warnings, Dosage, etc.)."
+
+
+def get_label_changes_for_updates(
+    updates: list[LabelUpdate],
+    max_workers: int = LABEL_CHANGES_MAX_WORKERS,
+) -> list[str]:
+    """Run get_label_changes for each update concurrently (bounded pool). Results are in input order."""
+    if not updates:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(lambda u: get_label_changes(u.setid, u.version), updates))
@@ -3,86 +3,609 @@ openFDA Drug Label API client for cross-validation with DailyMed.
 FDA updates weekly; DailyMed (NLM) may have different sync timing.
 """
 
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
+from functools import lru_cache
+from typing import ClassVar
+from urllib.parse import urlencode
 
+import diskcache
+import numpy as np
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import CACHE_DIR
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup
+    from json import loads as _json_loads
+
+try:
+    import ijson
+except ImportError:  # optional: stream-parse responses instead of decoding them whole
+    ijson = None
 
 OPENFDA_LABEL_URL = "https://api.fda.gov/drug/label.json"
+# Max set IDs OR'd into one openFDA search (keeps the query URL short)
+OPENFDA_BATCH_SIZE = 50
+# Max concurrent openFDA requests
+OPENFDA_MAX_WORKERS = 8
+# openFDA allows 240 requests per minute per IP without an API key
+OPENFDA_REQUESTS_PER_MINUTE = 240
+# On-disk lookups younger than this are used without re-querying openFDA (seconds)
+OPENFDA_DISK_CACHE_TTL = 7 * 86400
+# "No record found" is trusted only this long (seconds): new DailyMed labels often reach openFDA later
+OPENFDA_NOT_FOUND_TTL = 3600
+
+# Status templates indexed by sign(lag): [0] in sync, [1] DailyMed ahead, [-1] FDA ahead
+_MSG_SYNC = "FDA (openFDA): in sync — effective {}"
+_MSG_DM_AHEAD = "FDA (openFDA): DailyMed {} day(s) ahead — FDA effective {}"
+_MSG_FDA_AHEAD = "FDA (openFDA): FDA {} day(s) ahead — FDA effective {}"
+_LAG_TEMPLATES = (_MSG_SYNC, _MSG_DM_AHEAD, _MSG_FDA_AHEAD)
+
+# Shared session: keep-alive to api.fda.gov, retrying throttling and transient server errors
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "LabelWatch AI (https://github.com/tyrizzeh/LabelWatch)"
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
+
+
+class _RateLimiter:
+    """Thread-safe token bucket: at most `rate` calls per `per` seconds (bursts up to `rate`)."""
+
+    def __init__(self, rate: int, per: float):
+        self._capacity = float(rate)
+        self._tokens = float(rate)
+        self._fill_rate = rate / per
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._fill_rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._fill_rate
+            time.sleep(wait)
+
+
+_RATE_LIMITER = _RateLimiter(OPENFDA_REQUESTS_PER_MINUTE, 60.0)
+
+# In-process lookup cache by set ID. FDA labels change weekly at most; not-found answers expire
+# sooner (openFDA may still be indexing the label), and failed lookups (None) are remembered only
+# briefly so transient errors aren't sticky.
+_fda_cache: TTLCache = TTLCache(maxsize=4096, ttl=6 * 3600)
+_fda_not_found_cache: TTLCache = TTLCache(maxsize=1024, ttl=OPENFDA_NOT_FOUND_TTL)
+_fda_error_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_fda_cache_lock = threading.Lock()
+_MISS = object()
+
+# Single-flight: set IDs currently being fetched -> Future of their result. Concurrent callers
+# asking for the same set ID wait on the pending fetch instead of issuing their own request.
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Lookups persisted across runs, keyed by set ID. Entries are kept past OPENFDA_DISK_CACHE_TTL
+# (until evicted) so a failed request can fall back to the last known answer.
+_disk_cache = diskcache.Cache(
+    str(CACHE_DIR / "openfda"),
+    size_limit=int(50e6),
+    eviction_policy="least-recently-used",
+)
+
+
+# openFDA has no documented response-field projection. Ask for one anyway (Elasticsearch-style
+# _source filtering): if it is honored, records shrink to the fields we read; if it is ignored we
+# get the full record as before; if it is rejected (400 only with it), stop sending it for this process.
+_PROJECTION_PARAMS = {"_source": "set_id,effective_time,openfda.spl_set_id"}
+_projection_supported = True
+
+
+def get_session() -> requests.Session:
+    """
+    The requests.Session used for openFDA calls (e.g. to add headers or mount a test adapter).
+    Configure it before the first lookup: session headers and auth are merged once into a cached
+    request template.
+    """
+    return _SESSION
 
 
 @dataclass
 class FDALabelInfo:
     """Minimal FDA label info for cross-validation."""
     set_id: str
-    effective_date: date | None  # FDA effective_time (YYYYMMDD)
+    effective_date_ord: int  # FDA effective_time as a date ordinal (date.toordinal); 0 if not parsed
     effective_time_raw: str  # e.g. "20210902"
     found: bool
 
+    @property
+    def effective_date(self) -> date | None:
+        return date.fromordinal(self.effective_date_ord) if self.effective_date_ord else None
+
 
-def _parse_effective_time(eff: str) -> date | None:
-    """Parse FDA effective_time (YYYYMMDD) to date."""
-    if not eff or len(eff) < 8:
+def _disk_lookup(setid: str, fresh_only: bool = False) -> FDALabelInfo | None:
+    """
+    Persisted FDALabelInfo for setid, or None if absent. With fresh_only, entries older than
+    OPENFDA_DISK_CACHE_TTL (OPENFDA_NOT_FOUND_TTL for not-found answers) count as absent.
+    """
+    entry = _disk_cache.get(setid)
+    if entry is None:
         return None
+    if fresh_only:
+        max_age = OPENFDA_DISK_CACHE_TTL if entry["found"] else OPENFDA_NOT_FOUND_TTL
+        if time.time() - entry["fetched_at"] > max_age:
+            return None
+    if not entry["found"]:
+        return _not_found(setid)
+    return _label_info_from_record(setid, {"effective_time": entry["effective_time"]})
+
+
+def _remember(setid: str, info: FDALabelInfo) -> None:
+    with _fda_cache_lock:
+        (_fda_cache if info.found else _fda_not_found_cache)[setid] = info
+
+
+def _cache_lookup(setid: str):
+    """Cached FDALabelInfo (or None for a recent failure) for setid, or _MISS."""
+    with _fda_cache_lock:
+        info = _fda_cache.get(setid, _MISS)
+        if info is _MISS:
+            info = _fda_not_found_cache.get(setid, _MISS)
+        failed = info is _MISS and _fda_error_cache.get(setid, False)
+    if info is not _MISS:
+        return info
+    if failed:
+        return _disk_lookup(setid)  # stale-if-error
+    info = _disk_lookup(setid, fresh_only=True)
+    if info is None:
+        return _MISS
+    _remember(setid, info)
+    return info
+
+
+def _cache_store(setid: str, info: FDALabelInfo | None) -> FDALabelInfo | None:
+    """Remember a lookup result; on failure (None) returns the last persisted answer, if any."""
+    if info is None:
+        with _fda_cache_lock:
+            _fda_error_cache[setid] = True
+        return _disk_lookup(setid)
+    _remember(setid, info)
+    # Plain fields rather than the dataclass, so entries survive changes to FDALabelInfo
+    _disk_cache.set(
+        setid,
+        {"found": info.found, "effective_time": info.effective_time_raw, "fetched_at": time.time()},
+    )
+    return info
+
+
+def _claim(setids: list[str]) -> tuple[list[str], dict[str, Future]]:
+    """Split setids into those this caller must fetch and pending fetches (by set ID) to wait on."""
+    owned: list[str] = []
+    waiting: dict[str, Future] = {}
+    with _inflight_lock:
+        for sid in setids:
+            fut = _inflight.get(sid)
+            if fut is None:
+                _inflight[sid] = Future()
+                owned.append(sid)
+            else:
+                waiting[sid] = fut
+    return owned, waiting
+
+
+def _resolve(setid: str, info: FDALabelInfo | None) -> None:
+    """Publish an owned fetch's result to any waiters (no-op if already resolved)."""
+    with _inflight_lock:
+        fut = _inflight.pop(setid, None)
+    if fut is not None:
+        fut.set_result(info)
+
+
+def clear_cache() -> None:
+    """Forget all cached openFDA lookups, in memory and on disk."""
+    with _fda_cache_lock:
+        _fda_cache.clear()
+        _fda_not_found_cache.clear()
+        _fda_error_cache.clear()
+    _disk_cache.clear()
+
+
+@lru_cache(maxsize=1024)
+def _parse_effective_time(eff: str) -> int:
+    """Parse FDA effective_time (YYYYMMDD) to a date ordinal; 0 if not a valid date."""
+    if not eff or len(eff) < 8 or not eff[:8].isdigit():
+        return 0
     try:
-        return datetime.strptime(eff[:8], "%Y%m%d").date()
+        return date(int(eff[0:4]), int(eff[4:6]), int(eff[6:8])).toordinal()
     except ValueError:
-        return None
+        return 0
+
+
+def _label_info_from_record(setid: str, rec: dict) -> FDALabelInfo:
+    eff = rec.get("effective_time") or ""
+    return FDALabelInfo(
+        set_id=setid,
+        effective_date_ord=_parse_effective_time(eff),
+        effective_time_raw=eff,
+        found=True,
+    )
+
+
+def _not_found(setid: str) -> FDALabelInfo:
+    return FDALabelInfo(
+        set_id=setid,
+        effective_date_ord=0,
+        effective_time_raw="",
+        found=False,
+    )
 
 
 def fetch_fda_label_by_setid(setid: str) -> FDALabelInfo | None:
     """
     Fetch drug label from openFDA by set_id (SPL set ID).
-    Returns FDALabelInfo with effective date, or None on network/API error.
+    Returns FDALabelInfo with effective date, or None on network/API error (unless an earlier
+    answer is cached on disk). Results are cached in memory (TTL) and on disk.
     """
     if not setid:
         return None
-    # openFDA search: search=set_id:<value>
+    info = _cache_lookup(setid)
+    if info is not _MISS:
+        return info
+    owned, waiting = _claim([setid])
+    if waiting:
+        return waiting[setid].result()
+    info = None
     try:
-        r = requests.get(
-            OPENFDA_LABEL_URL,
-            params={"search": f"set_id:{setid}", "limit": 1},
-            timeout=15,
-        )
-        r.raise_for_status()
-        data = r.json()
-        results = data.get("results") or []
+        info = _cache_store(setid, _fetch_fda_label_by_setid_uncached(setid))
+    finally:
+        _resolve(setid, info)
+    return info
+
+
+@lru_cache(maxsize=4)
+def _label_request_template(url: str, projection: bool) -> tuple[requests.PreparedRequest, dict]:
+    """
+    GET url prepared through the session once (headers, auth, hooks, fixed params), plus the
+    environment send() settings (proxies, verify). Per-call params are appended to a copy.
+    """
+    prepared = _SESSION.prepare_request(
+        requests.Request("GET", url, params=_PROJECTION_PARAMS if projection else None)
+    )
+    settings = _SESSION.merge_environment_settings(prepared.url, {}, True, None, None)
+    return prepared, settings
+
+
+def _send_labels(search: str, limit: int, projection: bool) -> requests.Response:
+    template, settings = _label_request_template(OPENFDA_LABEL_URL, projection)
+    prepared = template.copy()
+    sep = "&" if "?" in prepared.url else "?"
+    prepared.url = f"{prepared.url}{sep}{urlencode({'search': search, 'limit': limit})}"
+    _RATE_LIMITER.acquire()
+    return _SESSION.send(prepared, timeout=15, **settings)
+
+
+def _get_labels(search: str, limit: int) -> requests.Response:
+    """Streamed openFDA label search (rate-limited), requesting only the fields we read."""
+    global _projection_supported
+    if not _projection_supported:
+        return _send_labels(search, limit, projection=False)
+    r = _send_labels(search, limit, projection=True)
+    if r.status_code != 400:
+        return r
+    r.close()
+    r = _send_labels(search, limit, projection=False)
+    # Only blame the projection if the same search succeeds without it (a malformed search
+    # is rejected either way)
+    if r.status_code != 400:
+        _projection_supported = False
+    return r
+
+
+def _label_records(r: requests.Response) -> list[dict]:
+    """
+    The "results" records of an openFDA label response, reduced to set_id, effective_time
+    and openfda.spl_set_id. With ijson the streamed body is parsed incrementally and the
+    label narrative fields are never assembled into dicts; otherwise it is decoded whole.
+    Raises ValueError on malformed JSON.
+    """
+    if ijson is None:
+        return _json_loads(r.content).get("results") or []
+    records: list[dict] = []
+    rec: dict = {}
+    events = ijson.sendable_list()
+    coro = ijson.parse_coro(events)
+    try:
+        for chunk in r.iter_content(chunk_size=65536):
+            coro.send(chunk)
+            for prefix, event, value in events:
+                if prefix == "results.item":
+                    if event == "start_map":
+                        rec = {}
+                    elif event == "end_map":
+                        records.append(rec)
+                elif prefix in ("results.item.set_id", "results.item.effective_time"):
+                    rec[prefix.rsplit(".", 1)[1]] = value
+                elif prefix == "results.item.openfda.spl_set_id.item":
+                    rec.setdefault("openfda", {}).setdefault("spl_set_id", []).append(value)
+            del events[:]
+        coro.close()
+    except ijson.JSONError as e:
+        raise ValueError(f"invalid openFDA JSON: {e}") from e
+    return records
+
+
+def _quote_term(value: str) -> str:
+    """value as a quoted openFDA (Lucene) search term, so odd characters can't break the query."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _fetch_fda_label_by_setid_uncached(setid: str) -> FDALabelInfo | None:
+    # openFDA search: search=set_id:"<value>"
+    try:
+        with _get_labels(f"set_id:{_quote_term(setid)}", 1) as r:
+            if r.status_code == 404:
+                # openFDA answers 404 when no record matches the search
+                return _not_found(setid)
+            r.raise_for_status()
+            results = _label_records(r)
         if not results:
-            return FDALabelInfo(
-                set_id=setid,
-                effective_date=None,
-                effective_time_raw="",
-                found=False,
-            )
-        rec = results[0]
-        eff = rec.get("effective_time") or ""
-        return FDALabelInfo(
-            set_id=setid,
-            effective_date=_parse_effective_time(eff),
-            effective_time_raw=eff,
-            found=True,
-        )
-    except requests.RequestException:
+            return _not_found(setid)
+        return _label_info_from_record(setid, results[0])
+    except (requests.RequestException, ValueError):
         return None
 
 
+def _fetch_fda_labels_batch(setids: list[str]) -> dict[str, FDALabelInfo | None]:
+    """
+    One openFDA search for up to OPENFDA_BATCH_SIZE set IDs (search=set_id:("a" OR "b" ...)).
+    Returns an entry per requested set ID; every entry is None on network/API error.
+    """
+    try:
+        with _get_labels(f"set_id:({' OR '.join(map(_quote_term, setids))})", len(setids)) as r:
+            if r.status_code == 404:
+                # openFDA answers 404 when no record matches the search
+                return {sid: _not_found(sid) for sid in setids}
+            r.raise_for_status()
+            results = _label_records(r)
+    except (requests.RequestException, ValueError):
+        return dict.fromkeys(setids)
+    wanted = set(setids)
+    found: dict[str, FDALabelInfo] = {}
+    for rec in results:
+        # set_id is top-level; openfda.spl_set_id (a list) covers records indexed only there
+        candidates = [rec.get("set_id"), *((rec.get("openfda") or {}).get("spl_set_id") or [])]
+        for sid in candidates:
+            if sid in wanted and sid not in found:
+                found[sid] = _label_info_from_record(sid, rec)
+    return {sid: found.get(sid) or _not_found(sid) for sid in setids}
+
+
+def fetch_fda_labels_by_setids(setids: list[str]) -> dict[str, FDALabelInfo | None]:
+    """
+    Look up many set IDs with OR'd openFDA searches (OPENFDA_BATCH_SIZE per request, batches in parallel).
+    Returns {set_id: FDALabelInfo} for every non-empty input; found=False if openFDA has no record,
+    None if that set ID's request failed and nothing is cached on disk. Cached set IDs are not re-queried,
+    and set IDs already being fetched by another thread are waited on rather than fetched twice.
+    """
+    out: dict[str, FDALabelInfo | None] = {}
+    missing = []
+    for sid in dict.fromkeys(s for s in setids if s):
+        info = _cache_lookup(sid)
+        if info is _MISS:
+            missing.append(sid)
+        else:
+            out[sid] = info
+    owned, waiting = _claim(missing)
+    batches = [owned[i:i + OPENFDA_BATCH_SIZE] for i in range(0, len(owned), OPENFDA_BATCH_SIZE)]
+    try:
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(OPENFDA_MAX_WORKERS, len(batches))) as ex:
+                for result in ex.map(_fetch_fda_labels_batch, batches):
+                    for sid, info in result.items():
+                        out[sid] = _cache_store(sid, info)
+                        _resolve(sid, out[sid])
+    finally:
+        for sid in owned:
+            _resolve(sid, out.get(sid))
+    # Set IDs another caller was already fetching
+    for sid, fut in waiting.items():
+        out[sid] = fut.result()
+    return out
+
+
+class FDAValidator:
+    """
+    Coalesces single set-ID lookups from concurrent callers into OR-batched openFDA searches.
+    The first queued set ID opens a tumbling window; when it closes (or max_batch set IDs are
+    waiting) they are fetched together with fetch_fda_labels_by_setids. Cached set IDs return at once.
+    Call close() (or use it as a context manager) to stop its collector thread and workers.
+    """
+
+    _STOP = object()
+
+    def __init__(self, window: float = 0.02, max_batch: int = OPENFDA_BATCH_SIZE):
+        self._window = window
+        self._max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(max_workers=OPENFDA_MAX_WORKERS, thread_name_prefix="fda-batch")
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._collect, name="fda-validator", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FDAValidator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Send any queued set IDs, wait for in-flight batches, and stop the worker threads."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(self._STOP)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def get(self, setid: str, timeout: float | None = None) -> FDALabelInfo | None:
+        """Same result as fetch_fda_label_by_setid(setid), fetched in a shared batch."""
+        if not setid:
+            return None
+        info = _cache_lookup(setid)
+        if info is not _MISS:
+            return info
+        fut: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("FDAValidator is closed")
+            self._queue.put((setid, fut))
+        return fut.result(timeout)
+
+    def _collect(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            # Fetch off this thread so the next window can fill while the request is in flight
+            self._executor.submit(self._fetch, batch)
+
+    @staticmethod
+    def _fetch(batch: list[tuple[str, Future]]) -> None:
+        try:
+            results = fetch_fda_labels_by_setids([sid for sid, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        for sid, fut in batch:
+            fut.set_result(results.get(sid))
+
+
+@dataclass(frozen=True, slots=True)
+class FDAValidationResult:
+    """
+    Outcome of comparing a DailyMed date with the FDA effective date. The status message is only
+    formatted when message() is called.
+    lag: DailyMed date minus FDA effective date in days (positive = DailyMed ahead), None if unknown.
+    """
+    NOT_QUERIED: ClassVar[int] = 0
+    NOT_FOUND: ClassVar[int] = 1
+    DATE_NOT_PARSED: ClassVar[int] = 2
+    DAILYMED_DATE_UNKNOWN: ClassVar[int] = 3
+    COMPARED: ClassVar[int] = 4
+
+    kind: int
+    lag: int | None = None
+    fda_date_ord: int = 0  # FDA effective date ordinal; 0 if unknown
+    raw: str = ""  # FDA effective_time as returned
+
+    @property
+    def fda_date(self) -> date | None:
+        return date.fromordinal(self.fda_date_ord) if self.fda_date_ord else None
+
+    def message(self) -> str:
+        if self.kind == self.COMPARED:
+            return _lag_result(self.lag, self.fda_date_ord)[0]
+        if self.kind == self.DAILYMED_DATE_UNKNOWN:
+            return f"FDA effective date: {_iso(self.fda_date_ord)} (DailyMed date unknown)"
+        if self.kind == self.DATE_NOT_PARSED:
+            return f"FDA (openFDA): effective date not parsed (raw: {self.raw})"
+        if self.kind == self.NOT_FOUND:
+            return "FDA (openFDA): no record found for this set ID"
+        return "FDA (openFDA): not queried"
+
+    def as_tuple(self) -> tuple[str, int | None]:
+        """(status_message, lag_days), the shape the report builders take."""
+        return (self.message(), self.lag)
+
+
+_NOT_QUERIED = FDAValidationResult(FDAValidationResult.NOT_QUERIED)
+
+
+def validation_tuples(results: list[FDAValidationResult]) -> list[tuple[str, int | None]]:
+    """Adapter for callers that take (status_message, lag_days) per row."""
+    return [r.as_tuple() for r in results]
+
+
 def fetch_fda_validation_for_matches(
     setids: list[str],
     dailymed_dates: list[date | None],
-) -> list[tuple[str, int | None]]:
+) -> list[FDAValidationResult]:
     """
     For each setid, fetch FDA label and compare with DailyMed date.
-    Returns list of (status_message, lag_days) per setid.
+    All set IDs are resolved up front with fetch_fda_labels_by_setids.
+    Returns one FDAValidationResult per setid, in input order (see validation_tuples).
+    Rows without a set ID share one immutable "not queried" result and skip the comparison.
     """
-    out = []
-    for i, setid in enumerate(setids):
-        dm_date = dailymed_dates[i] if i < len(dailymed_dates) else None
-        fda_info = fetch_fda_label_by_setid(setid)
-        msg, lag = cross_validate_dailymed_vs_fda(dm_date, fda_info)
-        out.append((msg, lag))
+    must_fetch = [i for i, setid in enumerate(setids) if setid]
+    out = [_NOT_QUERIED] * len(setids)
+    if not must_fetch:
+        return out
+    infos = fetch_fda_labels_by_setids([setids[i] for i in must_fetch])
+    results = cross_validate_batch(
+        [dailymed_dates[i] if i < len(dailymed_dates) else None for i in must_fetch],
+        [infos.get(setids[i]) for i in must_fetch],
+    )
+    for i, result in zip(must_fetch, results):
+        out[i] = result
     return out
 
 
+def _validation_result(dailymed_date: date | None, fda_info: FDALabelInfo | None) -> FDAValidationResult:
+    if fda_info is None:
+        return FDAValidationResult(FDAValidationResult.NOT_QUERIED)
+    if not fda_info.found:
+        return FDAValidationResult(FDAValidationResult.NOT_FOUND)
+    fda_ord = fda_info.effective_date_ord
+    if not fda_ord:
+        return FDAValidationResult(FDAValidationResult.DATE_NOT_PARSED, raw=fda_info.effective_time_raw)
+    if dailymed_date is None:
+        return FDAValidationResult(
+            FDAValidationResult.DAILYMED_DATE_UNKNOWN, fda_date_ord=fda_ord, raw=fda_info.effective_time_raw
+        )
+    return FDAValidationResult(
+        FDAValidationResult.COMPARED,
+        lag=dailymed_date.toordinal() - fda_ord,
+        fda_date_ord=fda_ord,
+        raw=fda_info.effective_time_raw,
+    )
+
+
 def cross_validate_dailymed_vs_fda(
     dailymed_date: date | None,
     fda_info: FDALabelInfo | None,
@@ -92,18 +615,49 @@ def cross_validate_dailymed_vs_fda(
     Returns (status_message, lag_days).
     lag_days: positive = DailyMed is ahead of FDA, negative = FDA is ahead, None = unknown.
     """
-    if fda_info is None:
-        return ("FDA (openFDA): not queried", None)
-    if not fda_info.found:
-        return ("FDA (openFDA): no record found for this set ID", None)
-    fda_d = fda_info.effective_date
-    if fda_d is None:
-        return (f"FDA (openFDA): effective date not parsed (raw: {fda_info.effective_time_raw})", None)
-    if dailymed_date is None:
-        return (f"FDA effective date: {fda_d.isoformat()} (DailyMed date unknown)", None)
-    lag = (dailymed_date - fda_d).days
-    if lag == 0:
-        return (f"FDA (openFDA): in sync — effective {fda_d.isoformat()}", 0)
-    if lag > 0:
-        return (f"FDA (openFDA): DailyMed {lag} day(s) ahead — FDA effective {fda_d.isoformat()}", lag)
-    return (f"FDA (openFDA): FDA {-lag} day(s) ahead — FDA effective {fda_d.isoformat()}", lag)
+    return _validation_result(dailymed_date, fda_info).as_tuple()
+
+
+def cross_validate_batch(
+    dailymed_dates: list[date | None],
+    fda_infos: list[FDALabelInfo | None],
+) -> list[FDAValidationResult]:
+    """
+    Compare dailymed_dates[i] with fda_infos[i] for every row.
+    Lags for all rows with both dates are computed in one numpy subtraction of date ordinals;
+    rows missing either date (ordinal 0) are classified individually.
+    """
+    fda_ords = np.array(
+        [info.effective_date_ord if info is not None and info.found else 0 for info in fda_infos],
+        dtype=np.int64,
+    )
+    dm_ords = np.array([d.toordinal() if d is not None else 0 for d in dailymed_dates], dtype=np.int64)
+    lags = dm_ords - fda_ords
+    known = (dm_ords != 0) & (fda_ords != 0)
+    out = []
+    for dm_date, fda_ord, info, lag, ok in zip(
+        dailymed_dates, fda_ords.tolist(), fda_infos, lags.tolist(), known.tolist()
+    ):
+        if ok:
+            out.append(FDAValidationResult(FDAValidationResult.COMPARED, lag, fda_ord, info.effective_time_raw))
+        else:
+            out.append(_validation_result(dm_date, info))
+    return out
+
+
+@lru_cache(maxsize=2048)
+def _iso(ordinal: int) -> str:
+    """ISO date string for a date ordinal (few distinct effective dates recur; format each once)."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+@lru_cache(maxsize=2048)
+def _sync_result(fda_ord: int) -> tuple[str, int]:
+    return (_MSG_SYNC.format(_iso(fda_ord)), 0)
+
+
+def _lag_result(lag: int, fda_ord: int) -> tuple[str, int]:
+    """Status message for a known lag (DailyMed date minus FDA effective date ordinal, in days)."""
+    if not lag:
+        return _sync_result(fda_ord)
+    return (_LAG_TEMPLATES[(lag > 0) - (lag < 0)].format(abs(lag), _iso(fda_ord)), lag)